@@ -1,16 +1,200 @@
 """Merge Queue Café — a tiny Flask app for demoing GitHub merge queues."""
 
-from flask import Flask, render_template
+import atexit
+import hmac
+import json
+import os
 
-from menu import get_categories, get_menu
+import click
+from flask import Flask, abort, jsonify, render_template, request
+
+from export import BackgroundExporter, export_site
+from locations import LocationMenus
+from menu_store import MenuError, MenuStore
+from orders import Kitchen, KitchenFullError, OrderError
 
 app = Flask(__name__)
 
+# When several workers serve the app, one process publishes the menu to a
+# shared memory segment and MENU_SNAPSHOT=<name> points the workers at it.
+# Those workers read the menu and its size limit from the segment and never
+# load menu.py or build a MenuStore of their own.
+#
+# The publisher is either `python3 menu_snapshot.py --name <name>`, which
+# follows menu.py, or this app run as a single process with
+# MENU_SNAPSHOT_PUBLISH=<name>, which also publishes every admin change.
+# The segment can only be created once, so a second publishing process
+# fails at startup instead of silently keeping its own menu.
+MENU_SNAPSHOT = os.environ.get("MENU_SNAPSHOT")
+MENU_SNAPSHOT_PUBLISH = os.environ.get("MENU_SNAPSHOT_PUBLISH")
+
+if MENU_SNAPSHOT:
+    from menu_snapshot import MenuSnapshotReader
+
+    menu_store = None
+    menu_source = MenuSnapshotReader(MENU_SNAPSHOT)
+else:
+    menu_store = menu_source = MenuStore()
+
+if MENU_SNAPSHOT_PUBLISH and menu_store is not None:
+    from menu_snapshot import MenuSnapshotPublisher
+
+    menu_publisher = MenuSnapshotPublisher(menu_store.max_size, MENU_SNAPSHOT_PUBLISH)
+    menu_publisher.publish(menu_store.current().menu)
+    menu_store.subscribe(lambda snapshot: menu_publisher.publish(snapshot.menu))
+    atexit.register(menu_publisher.close)
+
+location_menus = LocationMenus(menu_source)
+
+# Each process has its own kitchen; see "Orders and the Kitchen" in the README.
+# Stations start on the first order, so they run in the worker that takes it.
+kitchen = Kitchen(
+    stations=int(os.environ.get("KITCHEN_STATIONS", 2)),
+    queue_size=int(os.environ.get("KITCHEN_QUEUE_SIZE", 20)),
+    prep_times=json.loads(os.environ.get("KITCHEN_PREP_TIMES", "{}")),
+    default_prep_seconds=float(os.environ.get("KITCHEN_PREP_SECONDS", 2.0)),
+)
+
+# The admin API is disabled unless a token is configured.
+MENU_ADMIN_TOKEN = os.environ.get("MENU_ADMIN_TOKEN")
+
+
+def render_menu_page(snapshot):
+    return render_template(
+        "index.html", menu=snapshot.get_menu(), categories=snapshot.get_categories()
+    )
+
 
 @app.route("/")
 def index():
-    return render_template("index.html", menu=get_menu(), categories=get_categories())
+    return render_menu_page(menu_source.current())
+
+
+@app.route("/locations/<slug>/")
+def location_index(slug):
+    if location_menus.get_overlay(slug) is None:
+        abort(404, description="No such location.")
+    return location_menus.page(slug, render_menu_page)
+
+
+def render_static_page(snapshot):
+    with app.test_request_context("/"):
+        return render_menu_page(snapshot)
+
+
+# With STATIC_EXPORT_DIR set, the process that owns the menu exports the site
+# at startup and again, in the background, after every admin menu change.
+STATIC_EXPORT_DIR = os.environ.get("STATIC_EXPORT_DIR")
+
+if STATIC_EXPORT_DIR and menu_store is not None:
+    static_exporter = BackgroundExporter(STATIC_EXPORT_DIR, render_static_page, static_dir=app.static_folder)
+    static_exporter.submit(menu_store.current())
+    menu_store.subscribe(static_exporter.submit)
+
+
+@app.cli.command("export")
+@click.option("--out", default="build", show_default=True, help="Directory to write the site into.")
+@click.option("--force", is_flag=True, help="Re-render even if nothing changed.")
+def export_command(out, force):
+    """Export the menu page and static files as a static site."""
+    snapshot = menu_source.current()
+    if export_site(out, snapshot, render_static_page, static_dir=app.static_folder, force=force):
+        click.echo(f"Exported menu version {snapshot.version} to {out}/")
+    else:
+        click.echo(f"{out}/ is already up to date.")
+
+
+def _require_admin():
+    if not MENU_ADMIN_TOKEN:
+        abort(403, description="The menu admin API is disabled.")
+    supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if not hmac.compare_digest(supplied.encode(), MENU_ADMIN_TOKEN.encode()):
+        abort(401, description="Invalid admin token.")
+    if MENU_SNAPSHOT:
+        abort(
+            409,
+            description="This worker reads a shared menu snapshot; send admin changes to the publishing process.",
+        )
+
+
+def _json_object():
+    body = request.get_json(force=True, silent=True)
+    if not isinstance(body, dict):
+        raise MenuError("Request body must be a JSON object.")
+    return body
+
+
+def _menu_response(snapshot, status=200):
+    return jsonify(version=snapshot.version, menu=[dict(item) for item in snapshot.menu]), status
+
+
+@app.errorhandler(MenuError)
+def menu_error(error):
+    return jsonify(error=str(error)), 400
+
+
+@app.post("/admin/menu/items")
+def add_menu_item():
+    _require_admin()
+    return _menu_response(menu_store.add_item(_json_object()), 201)
+
+
+@app.patch("/admin/menu/items/<name>")
+def reprice_menu_item(name):
+    _require_admin()
+    return _menu_response(menu_store.reprice_item(name, _json_object().get("price")))
+
+
+@app.delete("/admin/menu/items/<name>")
+def remove_menu_item(name):
+    _require_admin()
+    return _menu_response(menu_store.remove_item(name))
+
+
+@app.post("/admin/menu/transaction")
+def apply_menu_transaction():
+    _require_admin()
+    changes = _json_object().get("changes")
+    if not isinstance(changes, list):
+        raise MenuError("Request body must contain a list of changes.")
+    return _menu_response(menu_store.apply(changes))
+
+
+@app.errorhandler(OrderError)
+def order_error(error):
+    return jsonify(error=str(error)), 400
+
+
+@app.errorhandler(KitchenFullError)
+def kitchen_full(error):
+    response = jsonify(error=str(error), retry_after=error.retry_after)
+    response.headers["Retry-After"] = str(error.retry_after)
+    return response, 429
+
+
+@app.post("/orders")
+def place_order():
+    body = request.get_json(force=True, silent=True)
+    if not isinstance(body, dict):
+        raise OrderError("Request body must be a JSON object.")
+    kitchen.start()
+    order = kitchen.submit(body.get("items"), menu_source.current())
+    return jsonify(order.to_dict()), 202
+
+
+@app.get("/orders/<order_id>")
+def order_status(order_id):
+    order = kitchen.get_order(order_id)
+    if order is None:
+        abort(404, description="No such order.")
+    return jsonify(order.to_dict())
+
+
+@app.get("/orders/metrics")
+def order_metrics():
+    return jsonify(kitchen.metrics())
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    # The reloader would import the app twice and publish from both processes.
+    app.run(debug=True, use_reloader=not MENU_SNAPSHOT_PUBLISH)
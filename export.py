@@ -0,0 +1,166 @@
+"""Export the café as a static site that nginx or a CDN can serve directly.
+
+The export writes ``index.html`` exactly as the live ``/`` route renders it,
+plus every file in ``static/`` under its own name, under a fingerprinted
+name, and gzip-compressed. The page keeps linking the plain names so it
+stays byte-identical to the live route; ``manifest.json`` maps each plain
+name to its fingerprinted copy for a CDN or deploy step that wants to
+cache assets immutably. The manifest also records the content hash of the
+menu, template and static files; when nothing has changed the export is
+skipped, and files that are no longer part of the export are removed.
+
+Every file is written to a temporary name and renamed into place, and
+``index.html`` goes after the assets, so a reader never sees a partial page
+or a page that points at assets that are not there yet.
+
+``BackgroundExporter`` runs exports on a worker thread for callers, such as
+the admin API, that must not wait for one.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+TEMPLATE = ROOT / "templates" / "index.html"
+STATIC_DIR = ROOT / "static"
+MANIFEST = "manifest.json"
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(snapshot, template=TEMPLATE, static_dir=STATIC_DIR):
+    """Hash everything the exported site depends on."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([dict(item) for item in snapshot.menu], sort_keys=True).encode())
+    digest.update(Path(template).read_bytes())
+    for path in sorted(Path(static_dir).rglob("*")):
+        if path.is_file():
+            digest.update(str(path.relative_to(static_dir)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def fingerprint(relative, data):
+    """Return ``relative`` with a short content hash before its suffix."""
+    path = Path(relative)
+    return str(path.with_name(f"{path.stem}.{hashlib.sha256(data).hexdigest()[:12]}{path.suffix}"))
+
+
+def write_atomic(path, data):
+    """Write ``data`` to ``path`` via a temporary file and a rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def write_with_gzip(path, data):
+    write_atomic(path, data)
+    write_atomic(path.with_name(path.name + ".gz"), gzip.compress(data, compresslevel=9, mtime=0))
+
+
+def export_site(out_dir, snapshot, render, static_dir=STATIC_DIR, template=TEMPLATE, force=False):
+    """Export the site for ``snapshot`` into ``out_dir``.
+
+    ``render`` turns a snapshot into the page HTML. Returns True if files
+    were written and False if the existing export was already current.
+    """
+    out_dir = Path(out_dir)
+    static_dir = Path(static_dir)
+    manifest_path = out_dir / MANIFEST
+    digest = content_hash(snapshot, template, static_dir)
+
+    if not force and manifest_path.exists():
+        if json.loads(manifest_path.read_text()).get("content_hash") == digest:
+            return False
+
+    assets = {}
+    written = set()
+    for path in sorted(static_dir.rglob("*")):
+        if not path.is_file():
+            continue
+        relative = str(path.relative_to(static_dir))
+        data = path.read_bytes()
+        assets[relative] = fingerprint(relative, data)
+        for name in (relative, assets[relative]):
+            target = out_dir / "static" / name
+            write_with_gzip(target, data)
+            written |= {target, target.with_name(target.name + ".gz")}
+
+    write_with_gzip(out_dir / "index.html", render(snapshot).encode())
+    manifest = {"content_hash": digest, "menu_version": snapshot.version, "assets": assets}
+    write_atomic(manifest_path, (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode())
+    _prune(out_dir / "static", written)
+    return True
+
+
+def _prune(directory, keep):
+    """Delete files under ``directory`` that are not in ``keep``."""
+    for path in sorted(directory.rglob("*"), reverse=True):
+        if path.is_file() and path not in keep:
+            path.unlink()
+        elif path.is_dir() and not any(path.iterdir()):
+            path.rmdir()
+
+
+class BackgroundExporter:
+    """Exports snapshots on one background thread, newest first.
+
+    ``submit()`` only records the snapshot and returns. If several snapshots
+    arrive while an export is running, only the latest is exported next.
+    """
+
+    def __init__(self, out_dir, render, static_dir=STATIC_DIR, template=TEMPLATE):
+        self.out_dir = out_dir
+        self.render = render
+        self.static_dir = static_dir
+        self.template = template
+        self._lock = threading.Lock()
+        self._pending = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._snapshot = None
+        self._pid = None
+
+    def submit(self, snapshot):
+        with self._lock:
+            self._snapshot = snapshot
+            self._idle.clear()
+            # Threads do not survive a fork, so start one per process.
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                threading.Thread(target=self._run, name="static-export", daemon=True).start()
+        self._pending.set()
+
+    def wait(self, timeout=None):
+        """Block until every submitted snapshot has been exported."""
+        return self._idle.wait(timeout)
+
+    def _run(self):
+        while True:
+            self._pending.wait()
+            with self._lock:
+                self._pending.clear()
+                snapshot, self._snapshot = self._snapshot, None
+            if snapshot is not None:
+                try:
+                    export_site(
+                        self.out_dir, snapshot, self.render, static_dir=self.static_dir, template=self.template
+                    )
+                except Exception:
+                    logger.exception("Static export of menu version %d failed", snapshot.version)
+            with self._lock:
+                if self._snapshot is None:
+                    self._idle.set()
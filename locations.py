@@ -0,0 +1,147 @@
+"""Per-location menus layered over the shared base menu.
+
+Each café location is described only by how it differs from the base menu:
+items it adds or replaces, prices it changes, items it drops and its own
+menu size limit, either absolute or relative to the base limit. The resolved
+menu for a location is a regular ``MenuSnapshot`` whose untouched items are
+the very same objects as in the base snapshot, so a location costs memory for
+its overlay, not for a copy of the whole menu.
+
+Resolved menus and rendered pages are cached per location and rebuilt only
+when that location's overlay or the base menu version changes.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+from menu_store import MenuError, MenuSnapshot
+
+DEFAULT_CACHE_SIZE = 128
+
+
+@dataclass(frozen=True)
+class LocationOverlay:
+    """How one location's menu differs from the base menu."""
+
+    slug: str
+    name: str
+    items: tuple = ()
+    prices: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
+    removed: frozenset = frozenset()
+    max_menu_size: int = None
+    extra_menu_size: int = 0
+
+    def is_empty(self):
+        return not (self.items or self.prices or self.removed)
+
+
+LOCATION_OVERLAYS = [
+    LocationOverlay(slug="downtown", name="Downtown"),
+    LocationOverlay(
+        slug="airport",
+        name="Airport",
+        prices=MappingProxyType({"Drip Coffee": 4.25, "Green Tea": 3.50}),
+        removed=frozenset({"Espresso"}),
+    ),
+    LocationOverlay(
+        slug="harbor",
+        name="Harbor",
+        items=({
+            "name": "Iced Tea",
+            "category": "tea",
+            "price": 3.25,
+            "description": "Black tea brewed strong and poured over ice.",
+        },),
+        # Relative to the base limit, so the extra item always fits however
+        # many drinks the base menu gains.
+        extra_menu_size=1,
+    ),
+]
+
+
+def resolve(base, overlay, max_size):
+    """Apply ``overlay`` to the ``base`` snapshot and return the location's snapshot."""
+    if overlay.is_empty():
+        items = base.menu
+    else:
+        replaced = {item["name"] for item in overlay.items}
+        items = []
+        for item in base.menu:
+            name = item["name"]
+            if name in overlay.removed or name in replaced:
+                continue
+            if name in overlay.prices:
+                item = {**item, "price": overlay.prices[name]}
+            items.append(item)
+        items += overlay.items
+
+    if overlay.max_menu_size is not None:
+        limit = overlay.max_menu_size
+    else:
+        limit = max_size + overlay.extra_menu_size
+    if len(items) > limit:
+        raise MenuError(
+            f"{overlay.name} would have {len(items)} items but its kitchen can only handle {limit}."
+        )
+    if items is base.menu:
+        return base
+    return MenuSnapshot.build(base.version, items)
+
+
+class LocationMenus:
+    """Resolves and caches menus for every location on top of one base menu.
+
+    ``source`` is anything with a ``current()`` snapshot and a ``max_size``,
+    such as a ``MenuStore`` or a ``MenuSnapshotReader``.
+    """
+
+    def __init__(self, source, overlays=LOCATION_OVERLAYS, cache_size=DEFAULT_CACHE_SIZE):
+        self.source = source
+        self.cache_size = cache_size
+        self._overlays = {overlay.slug: overlay for overlay in overlays}
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def slugs(self):
+        return sorted(self._overlays)
+
+    def get_overlay(self, slug):
+        return self._overlays.get(slug)
+
+    def set_overlay(self, overlay):
+        """Add or replace a location. Only that location's cache is dropped."""
+        resolve(self.source.current(), overlay, self.source.max_size)
+        with self._lock:
+            self._overlays[overlay.slug] = overlay
+            self._cache.pop(overlay.slug, None)
+
+    def current(self, slug):
+        """Return the resolved snapshot for ``slug``, or None for an unknown location."""
+        return self._entry(slug)["snapshot"] if slug in self._overlays else None
+
+    def page(self, slug, render):
+        """Return the rendered page for ``slug``, rendering it at most once per version."""
+        entry = self._entry(slug)
+        if "page" not in entry:
+            entry["page"] = render(entry["snapshot"])
+        return entry["page"]
+
+    def _entry(self, slug):
+        base = self.source.current()
+        overlay = self._overlays[slug]
+        with self._lock:
+            entry = self._cache.get(slug)
+            if entry is not None and entry["version"] == base.version and entry["overlay"] is overlay:
+                self._cache.move_to_end(slug)
+                return entry
+
+        snapshot = resolve(base, overlay, self.source.max_size)
+        entry = {"version": base.version, "overlay": overlay, "snapshot": snapshot}
+        with self._lock:
+            self._cache[slug] = entry
+            self._cache.move_to_end(slug)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return entry
@@ -0,0 +1,250 @@
+"""Menu snapshots shared between worker processes.
+
+One process publishes the sorted menu into a shared memory segment; every
+worker attaches to the same segment and reads it without taking a lock.
+
+Layout (little-endian):
+
+    header  magic "MQCM", layout version, flags, sequence, payload length, item count,
+            max menu size
+    record  price in cents, name length, category length, description length,
+            followed by the three UTF-8 strings
+
+The sequence number works as a seqlock: it is odd while the publisher is
+writing and even once a snapshot is complete, so readers retry instead of
+waiting when they catch a write in progress. A reader that cannot get a
+clean read within ``READ_TIMEOUT`` keeps serving the last version it had,
+and does not try again until the sequence moves.
+
+Readers never import ``menu.py``: the menu and its size limit both come from
+the segment. Each worker still decodes the version it serves into its own
+small ``MenuSnapshot``, so per-worker memory is that decoded copy and nothing
+else.
+
+Run the publisher next to the workers; it republishes whenever ``menu.py``
+changes on disk:
+
+    python3 menu_snapshot.py --name cafe-menu &
+    MENU_SNAPSHOT=cafe-menu gunicorn -w 4 app:app
+"""
+
+import argparse
+import importlib
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+
+from menu_store import MenuSnapshot
+
+MAGIC = b"MQCM"
+LAYOUT_VERSION = 2
+DEFAULT_CAPACITY = 64 * 1024
+
+HEADER = struct.Struct("<4sHHQIII")
+RECORD = struct.Struct("<IHHH")
+SEQUENCE = struct.Struct("<Q")
+SEQUENCE_OFFSET = 8
+READ_TIMEOUT = 0.05
+
+# Segments created by this process, which must stay registered with the
+# resource tracker so they are cleaned up if the publisher dies.
+_created = set()
+
+
+def encode_menu(items):
+    """Pack menu items into the compact binary record format."""
+    parts = []
+    for item in items:
+        name = item["name"].encode()
+        category = item["category"].encode()
+        description = item["description"].encode()
+        parts.append(RECORD.pack(round(item["price"] * 100), len(name), len(category), len(description)))
+        parts += [name, category, description]
+    return b"".join(parts)
+
+
+def decode_menu(payload, count):
+    """Unpack ``count`` records from ``payload`` into menu item dicts."""
+    items = []
+    offset = 0
+    for _ in range(count):
+        cents, name_len, category_len, description_len = RECORD.unpack_from(payload, offset)
+        offset += RECORD.size
+        name = bytes(payload[offset:offset + name_len]).decode()
+        offset += name_len
+        category = bytes(payload[offset:offset + category_len]).decode()
+        offset += category_len
+        description = bytes(payload[offset:offset + description_len]).decode()
+        offset += description_len
+        items.append({
+            "name": name,
+            "category": category,
+            "price": cents / 100,
+            "description": description,
+        })
+    return tuple(items)
+
+
+class MenuSnapshotPublisher:
+    """Owns the shared segment and writes new menu versions into it.
+
+    ``max_size`` is the kitchen's menu size limit, published alongside the
+    menu so readers do not need ``menu.py`` to know it.
+    """
+
+    def __init__(self, max_size, name=None, capacity=DEFAULT_CAPACITY):
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=HEADER.size + capacity)
+        _created.add(self.shm.name)
+        self.capacity = capacity
+        self.max_size = max_size
+        self.sequence = 0
+        HEADER.pack_into(self.shm.buf, 0, MAGIC, LAYOUT_VERSION, 0, 0, 0, 0, max_size)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def publish(self, items):
+        """Write ``items`` as a new snapshot and return its version."""
+        items = sorted(items, key=lambda item: (item["category"], item["name"]))
+        payload = encode_menu(items)
+        if len(payload) > self.capacity:
+            raise ValueError(
+                f"Menu snapshot needs {len(payload)} bytes but the segment only holds {self.capacity}."
+            )
+
+        buf = self.shm.buf
+        HEADER.pack_into(
+            buf, 0, MAGIC, LAYOUT_VERSION, 0, self.sequence + 1, len(payload), len(items), self.max_size
+        )
+        buf[HEADER.size:HEADER.size + len(payload)] = payload
+        self.sequence += 2
+        SEQUENCE.pack_into(buf, SEQUENCE_OFFSET, self.sequence)
+        return self.version
+
+    @property
+    def version(self):
+        return self.sequence // 2
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+        _created.discard(self.shm.name)
+
+
+class MenuSnapshotReader:
+    """Attaches to a published segment and decodes it once per version."""
+
+    def __init__(self, name):
+        self.shm = _attach(name)
+        magic, layout, *_ = HEADER.unpack_from(self.shm.buf, 0)
+        if magic != MAGIC or layout != LAYOUT_VERSION:
+            raise ValueError(f"Shared memory segment {name!r} does not hold a menu snapshot.")
+        self._sequence = None
+        self._stalled = None
+        self._current = MenuSnapshot.build(0, ())
+
+    @property
+    def version(self):
+        return SEQUENCE.unpack_from(self.shm.buf, SEQUENCE_OFFSET)[0] // 2
+
+    @property
+    def max_size(self):
+        return HEADER.unpack_from(self.shm.buf, 0)[-1]
+
+    def _refresh(self):
+        buf = self.shm.buf
+        deadline = None
+        while True:
+            before = SEQUENCE.unpack_from(buf, SEQUENCE_OFFSET)[0]
+            if before in (self._sequence, self._stalled):
+                return
+            if not before % 2:
+                _, _, _, _, length, count, _ = HEADER.unpack_from(buf, 0)
+                try:
+                    items = decode_menu(buf[HEADER.size:HEADER.size + length], count)
+                except (struct.error, UnicodeDecodeError):
+                    # Torn read while the publisher was writing; retried below.
+                    items = None
+                if items is not None and SEQUENCE.unpack_from(buf, SEQUENCE_OFFSET)[0] == before:
+                    break
+
+            # A write is in progress. Yield to it, but never wait forever on a
+            # publisher that died mid-write: keep serving the last good version
+            # and skip straight to it until the sequence moves again.
+            deadline = deadline or time.monotonic() + READ_TIMEOUT
+            if time.monotonic() > deadline:
+                self._stalled = before
+                return
+            time.sleep(0)
+
+        self._current = MenuSnapshot.build(before // 2, items)
+        self._sequence = before
+        self._stalled = None
+
+    def current(self):
+        """Return the latest published menu as an immutable snapshot."""
+        self._refresh()
+        return self._current
+
+    def get_menu(self):
+        return self.current().get_menu()
+
+    def get_categories(self):
+        return self.current().get_categories()
+
+    def close(self):
+        self.shm.close()
+
+
+def _attach(name):
+    """Open an existing segment without letting this process unlink it at exit."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 registers every attach with the resource tracker,
+        # which would destroy the segment when the first worker exits. The
+        # registration is shared per process, so leave it alone if this
+        # process is the publisher.
+        shm = shared_memory.SharedMemory(name=name)
+        if shm.name not in _created:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish the café menu to shared memory.")
+    parser.add_argument("--name", required=True, help="shared memory segment name")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY)
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between checks of menu.py")
+    args = parser.parse_args()
+
+    import menu
+
+    menu_path = Path(menu.__file__)
+    mtime = menu_path.stat().st_mtime
+    publisher = MenuSnapshotPublisher(menu.MAX_MENU_SIZE, args.name, args.capacity)
+    print(f"📣 Published menu version {publisher.publish(menu.MENU_ITEMS)} to {publisher.name}")
+    try:
+        while True:
+            time.sleep(args.interval)
+            if menu_path.stat().st_mtime == mtime:
+                continue
+            mtime = menu_path.stat().st_mtime
+            try:
+                importlib.reload(menu)
+                publisher.max_size = menu.MAX_MENU_SIZE
+                version = publisher.publish(menu.MENU_ITEMS)
+            except (RuntimeError, SyntaxError, ValueError) as error:
+                print(f"⚠️  Keeping the current menu: {error}")
+                continue
+            print(f"📣 Published menu version {version}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publisher.close()
+
+
+if __name__ == "__main__":
+    main()
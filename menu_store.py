@@ -0,0 +1,192 @@
+"""Versioned, copy-on-write menu snapshots with an admin write API.
+
+Readers call ``MenuStore.current()`` and get an immutable ``MenuSnapshot``;
+that is a single attribute read, so it never blocks and never observes a
+change that is only partly applied. Writers serialize on a lock, build a
+brand-new snapshot from the current one and swap it in. Old snapshots are
+ordinary objects, so they are freed as soon as the last request holding one
+lets go of it.
+"""
+
+import logging
+import math
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from types import MappingProxyType
+
+REQUIRED_FIELDS = ("name", "category", "price", "description")
+
+logger = logging.getLogger(__name__)
+
+
+class MenuError(ValueError):
+    """Raised when a menu change would leave the menu invalid."""
+
+
+@dataclass(frozen=True)
+class MenuSnapshot:
+    """One immutable version of the menu with its derived views."""
+
+    version: int
+    menu: tuple
+    categories: tuple
+
+    @classmethod
+    def build(cls, version, items):
+        # Items that are already read-only are shared, not copied, so
+        # unchanged items cost nothing across versions.
+        menu = tuple(sorted(
+            (item if isinstance(item, MappingProxyType) else MappingProxyType(dict(item))
+             for item in items),
+            key=lambda item: (item["category"], item["name"]),
+        ))
+        return cls(version, menu, tuple(sorted({item["category"] for item in menu})))
+
+    def get_menu(self):
+        """Return the menu sorted by category then name."""
+        return list(self.menu)
+
+    def get_categories(self):
+        """Return unique categories from the menu."""
+        return list(self.categories)
+
+
+class MenuTransaction:
+    """A batch of changes that is applied all at once or not at all."""
+
+    def __init__(self, snapshot):
+        self._items = {item["name"]: item for item in snapshot.menu}
+        self.snapshot = None
+
+    def add(self, item):
+        if not isinstance(item, Mapping):
+            raise MenuError("Menu item must be an object.")
+        missing = [field for field in REQUIRED_FIELDS if field not in item]
+        if missing:
+            raise MenuError(f"Menu item is missing fields: {', '.join(missing)}.")
+        for field in ("name", "category", "description"):
+            if not isinstance(item[field], str) or not item[field].strip():
+                raise MenuError(f"Menu item {field} must be a non-empty string.")
+        if item["name"] in self._items:
+            raise MenuError(f"{item['name']} is already on the menu.")
+        _check_price(item["name"], item["price"])
+        self._items[item["name"]] = {field: item[field] for field in REQUIRED_FIELDS}
+
+    def reprice(self, name, price):
+        _check_price(name, price)
+        self._items[name] = {**self._get(name), "price": price}
+
+    def remove(self, name):
+        self._get(name)
+        del self._items[name]
+
+    def _get(self, name):
+        if not isinstance(name, str):
+            raise MenuError("Menu item name must be a string.")
+        try:
+            return self._items[name]
+        except KeyError:
+            raise MenuError(f"{name} is not on the menu.") from None
+
+
+class MenuStore:
+    """Holds the current menu snapshot and swaps in new versions atomically."""
+
+    def __init__(self, items=None, max_size=None):
+        if items is None or max_size is None:
+            # Imported here so that workers reading a shared snapshot, which
+            # never build a store, never load menu.py either.
+            import menu
+
+            items = menu.MENU_ITEMS if items is None else items
+            max_size = menu.MAX_MENU_SIZE if max_size is None else max_size
+        self.max_size = max_size
+        self._write_lock = threading.Lock()
+        self._snapshot = MenuSnapshot.build(0, items)
+        self._listeners = []
+
+    def subscribe(self, listener):
+        """Call ``listener(snapshot)`` after every new snapshot is swapped in.
+
+        Listeners run on the writer's thread while the write lock is held, so
+        they see snapshots one at a time and in order. By then the change is
+        committed, so a listener that raises is logged and does not fail it.
+        """
+        self._listeners.append(listener)
+
+    def current(self):
+        """Return the latest snapshot. Never blocks."""
+        return self._snapshot
+
+    def get_menu(self):
+        return self._snapshot.get_menu()
+
+    def get_categories(self):
+        return self._snapshot.get_categories()
+
+    @contextmanager
+    def transaction(self):
+        """Collect several changes and publish them as one new snapshot.
+
+        Nothing is published if the block raises.
+        """
+        with self._write_lock:
+            base = self._snapshot
+            txn = MenuTransaction(base)
+            yield txn
+            items = txn._items.values()
+            if len(items) > self.max_size:
+                raise MenuError(
+                    f"Menu would have {len(items)} items but the kitchen can only handle "
+                    f"{self.max_size}."
+                )
+            txn.snapshot = self._snapshot = MenuSnapshot.build(base.version + 1, items)
+            for listener in self._listeners:
+                try:
+                    listener(txn.snapshot)
+                except Exception:
+                    logger.exception("Menu listener %r failed for version %d", listener, txn.snapshot.version)
+
+    def add_item(self, item):
+        with self.transaction() as txn:
+            txn.add(item)
+        return txn.snapshot
+
+    def reprice_item(self, name, price):
+        with self.transaction() as txn:
+            txn.reprice(name, price)
+        return txn.snapshot
+
+    def remove_item(self, name):
+        with self.transaction() as txn:
+            txn.remove(name)
+        return txn.snapshot
+
+    def apply(self, changes):
+        """Apply a list of ``{"op": "add" | "reprice" | "remove", ...}`` changes atomically."""
+        with self.transaction() as txn:
+            for change in changes:
+                if not isinstance(change, Mapping):
+                    raise MenuError("Each menu change must be an object.")
+                op = change.get("op")
+                if op == "add":
+                    txn.add(change.get("item") or {})
+                elif op == "reprice":
+                    txn.reprice(change.get("name"), change.get("price"))
+                elif op == "remove":
+                    txn.remove(change.get("name"))
+                else:
+                    raise MenuError(f"Unknown menu change {op!r}.")
+        return txn.snapshot
+
+
+def _check_price(name, price):
+    if (
+        isinstance(price, bool)
+        or not isinstance(price, (int, float))
+        or (isinstance(price, float) and not math.isfinite(price))
+        or price <= 0
+    ):
+        raise MenuError(f"{name} must have a positive price.")
@@ -0,0 +1,232 @@
+"""Order intake and the kitchen that works through it.
+
+Orders are validated against the current menu snapshot and put on a bounded
+queue. A fixed number of station threads take orders off the queue and
+"prepare" them for the configured prep time of each item. When the queue is
+full the kitchen refuses new orders with a hint of when to retry, rather
+than letting the backlog grow without bound.
+
+A kitchen lives in one process. Its stations start on the first ``start()``
+call in that process, so a kitchen created before a server forks its
+workers still gets stations in the worker that uses it.
+"""
+
+import math
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+DEFAULT_STATIONS = 2
+DEFAULT_QUEUE_SIZE = 20
+DEFAULT_PREP_SECONDS = 2.0
+MAX_QUANTITY = 10
+RECENT_ORDERS = 1000
+THROUGHPUT_WINDOW = 60.0
+
+
+class OrderError(ValueError):
+    """Raised when an order does not match the menu."""
+
+
+class KitchenFullError(Exception):
+    """Raised when the order queue is full."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"The kitchen is full. Try again in {retry_after} seconds.")
+        self.retry_after = retry_after
+
+
+@dataclass
+class Order:
+    id: str
+    lines: tuple
+    prep_seconds: float
+    status: str = "queued"
+    created_at: float = field(default_factory=time.monotonic)
+    started_at: float = None
+    ready_at: float = None
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "items": [{"name": name, "quantity": quantity} for name, quantity in self.lines],
+            "status": self.status,
+        }
+
+
+class Kitchen:
+    """A bounded order queue served by a pool of station threads."""
+
+    def __init__(
+        self,
+        stations=DEFAULT_STATIONS,
+        queue_size=DEFAULT_QUEUE_SIZE,
+        prep_times=None,
+        default_prep_seconds=DEFAULT_PREP_SECONDS,
+        sleep=time.sleep,
+    ):
+        _check_count("stations", stations)
+        _check_count("queue_size", queue_size)
+        prep_times = prep_times or {}
+        if not isinstance(prep_times, Mapping):
+            raise ValueError("prep_times must map item names to seconds.")
+        for name, seconds in prep_times.items():
+            _check_prep_seconds(f"Prep time for {name}", seconds)
+        _check_prep_seconds("default_prep_seconds", default_prep_seconds)
+
+        self.stations = stations
+        self.prep_times = dict(prep_times)
+        self.default_prep_seconds = default_prep_seconds
+        self._sleep = sleep
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._orders = OrderedDict()
+        self._completed_at = deque()
+        self._in_progress = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._queued_seconds = 0.0
+        self._threads = []
+        self._pid = None
+
+    def start(self):
+        """Start the stations in this process unless they are already running.
+
+        Threads do not survive a fork, so stations started in a parent
+        process are started again in the child.
+        """
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._threads = []
+            for number in range(self.stations):
+                thread = threading.Thread(target=self._work, name=f"station-{number + 1}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self):
+        """Let the stations finish what is queued, then shut them down."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+        self._pid = None
+
+    def prep_time(self, name):
+        return self.prep_times.get(name, self.default_prep_seconds)
+
+    def submit(self, items, snapshot):
+        """Validate ``items`` against ``snapshot`` and queue the order.
+
+        ``items`` is a list of ``{"name": ..., "quantity": ...}`` lines.
+        """
+        lines = _validate(items, {item["name"] for item in snapshot.menu})
+        order = Order(
+            id=uuid.uuid4().hex,
+            lines=lines,
+            prep_seconds=sum(self.prep_time(name) * quantity for name, quantity in lines),
+        )
+        with self._lock:
+            self._orders[order.id] = order
+            if len(self._orders) > RECENT_ORDERS:
+                self._orders.popitem(last=False)
+            self._queued_seconds += order.prep_seconds
+        try:
+            self._queue.put_nowait(order)
+        except queue.Full:
+            with self._lock:
+                self._orders.pop(order.id, None)
+                self._queued_seconds -= order.prep_seconds
+                self._rejected += 1
+            raise KitchenFullError(self.retry_after()) from None
+        return order
+
+    def get_order(self, order_id):
+        with self._lock:
+            return self._orders.get(order_id)
+
+    def retry_after(self):
+        """Estimate, in whole seconds, how long the stations need to clear the queue."""
+        with self._lock:
+            return max(1, math.ceil(self._queued_seconds / self.stations))
+
+    def metrics(self):
+        now = time.monotonic()
+        with self._lock:
+            self._trim_throughput(now)
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self._queue.maxsize,
+                "stations": self.stations,
+                "in_progress": self._in_progress,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "throughput_per_minute": len(self._completed_at) * 60.0 / THROUGHPUT_WINDOW,
+                "average_wait_seconds": self._total_wait / self._completed if self._completed else 0.0,
+            }
+
+    def _work(self):
+        while True:
+            order = self._queue.get()
+            if order is None:
+                return
+            with self._lock:
+                self._queued_seconds -= order.prep_seconds
+                order.status = "preparing"
+                order.started_at = time.monotonic()
+                self._in_progress += 1
+
+            self._sleep(order.prep_seconds)
+
+            with self._lock:
+                order.status = "ready"
+                order.ready_at = time.monotonic()
+                self._in_progress -= 1
+                self._completed += 1
+                self._total_wait += order.ready_at - order.created_at
+                self._completed_at.append(order.ready_at)
+                self._trim_throughput(order.ready_at)
+
+    def _trim_throughput(self, now):
+        while self._completed_at and now - self._completed_at[0] > THROUGHPUT_WINDOW:
+            self._completed_at.popleft()
+
+
+def _check_count(name, value):
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"{name} must be a whole number of at least 1.")
+
+
+def _check_prep_seconds(name, seconds):
+    if (
+        isinstance(seconds, bool)
+        or not isinstance(seconds, (int, float))
+        or not math.isfinite(seconds)
+        or seconds < 0
+    ):
+        raise ValueError(f"{name} must be a finite number of seconds, not {seconds!r}.")
+
+
+def _validate(items, menu_names):
+    if not isinstance(items, list) or not items:
+        raise OrderError("An order needs a non-empty list of items.")
+    lines = []
+    for line in items:
+        if not isinstance(line, dict):
+            raise OrderError("Each order line must be an object.")
+        name = line.get("name")
+        quantity = line.get("quantity", 1)
+        if not isinstance(name, str) or name not in menu_names:
+            raise OrderError(f"{name} is not on the menu.")
+        if isinstance(quantity, bool) or not isinstance(quantity, int) or not 1 <= quantity <= MAX_QUANTITY:
+            raise OrderError(f"Quantity for {name} must be between 1 and {MAX_QUANTITY}.")
+        lines.append((name, quantity))
+    return tuple(lines)
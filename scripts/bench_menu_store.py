@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Stress-test the menu store with concurrent readers and writers.
+
+Every write reprices all items to the same value in one transaction, so a
+reader that ever sees two different prices in one snapshot has caught a
+half-applied change.
+
+Usage:
+    python3 scripts/bench_menu_store.py [--readers 8] [--writers 2] [--seconds 5]
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from menu_store import MenuStore  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    store = MenuStore()
+    names = [item["name"] for item in store.current().menu]
+    stop = threading.Event()
+    reads = [0] * args.readers
+    writes = [0] * args.writers
+    torn = []
+
+    def read(slot):
+        while not stop.is_set():
+            snapshot = store.current()
+            prices = {item["price"] for item in snapshot.menu}
+            if snapshot.version and len(prices) != 1:
+                torn.append((snapshot.version, prices))
+            reads[slot] += 1
+
+    def write(slot):
+        price = 1.0 + slot
+        while not stop.is_set():
+            store.apply([{"op": "reprice", "name": name, "price": price} for name in names])
+            price += args.writers
+            writes[slot] += 1
+
+    threads = [threading.Thread(target=read, args=(i,)) for i in range(args.readers)]
+    threads += [threading.Thread(target=write, args=(i,)) for i in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    print(f"Readers: {args.readers}  Writers: {args.writers}  Duration: {args.seconds:.1f}s")
+    print(f"  Reads:  {sum(reads):>10,}  ({sum(reads) / args.seconds:,.0f}/s)")
+    print(f"  Writes: {sum(writes):>10,}  ({sum(writes) / args.seconds:,.0f}/s)")
+    print(f"  Final version: {store.current().version}")
+    if torn:
+        print(f"❌ {len(torn)} reads saw a half-applied change, first: {torn[0]}")
+        sys.exit(1)
+    print("✅ No reader saw a half-applied change.")
+
+
+if __name__ == "__main__":
+    main()
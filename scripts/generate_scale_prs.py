@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""Generate hundreds or thousands of synthetic PR branches for load-testing.
+
+The 18 demo PRs are far too few to stress a merge queue. This script makes N
+synthetic drink, style and config PRs in the same shape as create_prs.py,
+adds a matching `# slot:` marker for each one, and writes the base commit
+and every branch into a local bare repository with a single
+`git fast-import` run, so thousands of branches take seconds.
+
+Some PRs are made to fail on purpose:
+- with --conflict-rate, a PR edits the same slot (or file) as an earlier PR,
+  so the two cannot both be merged without a git conflict;
+- with --failure-rate, a drink PR reuses another PR's drink name, so each
+  passes CI alone but test_names_are_unique fails once both are merged.
+
+A JSON manifest lists every PR and which other PR it conflicts or fails with,
+for driving a local queue simulation.
+
+The base commit has no parent, so the script refuses to write into a
+repository that already has branches unless --force is given; with --force
+the base branch is replaced and every old scale-* branch is deleted.
+
+Usage:
+    python3 scripts/generate_scale_prs.py --count 1000 --repo /tmp/cafe-scale.git \\
+        [--conflict-rate 0.05] [--failure-rate 0.05] [--seed 1] [--manifest prs.json] [--force]
+"""
+
+import argparse
+import contextlib
+import json
+import random
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+KINDS = ("drink", "style", "config")
+
+FLAVOURS = ["Vanilla", "Hazelnut", "Caramel", "Maple", "Lavender", "Honey", "Cinnamon", "Mint",
+            "Coconut", "Almond", "Ginger", "Orange", "Cardamom", "Rose", "Toffee", "Smoked"]
+DRINKS = {
+    "COFFEE_ITEMS": ("coffee", ["Latte", "Flat White", "Cortado", "Macchiato", "Mocha", "Breve"]),
+    "TEA_ITEMS": ("tea", ["Chai", "Oolong", "Sencha", "Rooibos", "Earl Grey", "Genmaicha"]),
+    "OTHER_ITEMS": ("other", ["Steamer", "Cocoa", "Cider", "Lemonade"]),
+}
+COLOURS = ["#3b2f2f", "#6f4e37", "#a67b5b", "#c8ad7f", "#e9b872", "#0f3460", "#16213e", "#e74c3c"]
+
+
+# ---------------------------------------------------------------------------
+# PR generation
+# ---------------------------------------------------------------------------
+
+def drink_item(name, category, price, description):
+    """Render a menu item exactly like the drink PRs in create_prs.py do."""
+    return (
+        f'    {{\n'
+        f'        "name": "{name}",\n'
+        f'        "category": "{category}",\n'
+        f'        "price": {price:.2f},\n'
+        f'        "description": "{description}",\n'
+        f'    }}'
+    )
+
+
+def generate_prs(count, conflict_rate, failure_rate, rng):
+    """Return (prs, slots) where slots maps each menu list / "css" to its new slot ids."""
+    prs = []
+    slots = {name: [] for name in DRINKS} | {"css": []}
+    by_kind = {kind: [] for kind in KINDS}
+
+    for i in range(1, count + 1):
+        kind = rng.choice(KINDS)
+        pr_id = f"scale-{kind}-{i:05d}"
+        pr = {"branch": pr_id, "kind": kind, "conflicts_with": None, "fails_with": None}
+        earlier = by_kind[kind]
+        target = rng.choice(earlier) if earlier and rng.random() < conflict_rate else None
+        if target is not None:
+            pr["conflicts_with"] = target["branch"]
+
+        if kind == "drink":
+            list_name = target["list"] if target else rng.choice(list(DRINKS))
+            category, bases = DRINKS[list_name]
+            slot_id = target["slot"] if target else pr_id
+            if target is None:
+                slots[list_name].append(slot_id)
+
+            drinks = [other for other in earlier if other is not target]
+            twin = rng.choice(drinks) if drinks and rng.random() < failure_rate else None
+            name = twin["name"] if twin else f"{rng.choice(FLAVOURS)} {rng.choice(bases)} {i}"
+            if twin:
+                pr["fails_with"] = twin["branch"]
+            price = rng.randint(10, 18) / 4
+            description = f"A synthetic {category} drink for merge queue load tests (#{i})."
+            pr.update(list=list_name, slot=slot_id, name=name)
+            pr["title"] = f"Add {name} to menu"
+            pr["body"] = f"Adds **{name}** (${price:.2f}) to the café menu under the *{category}* category."
+            pr["changes"] = [{
+                "file": "menu.py",
+                "search": f"    # slot:{slot_id}",
+                "replace": f"{drink_item(name, category, price, description)},\n    # slot:{slot_id}",
+            }]
+
+        elif kind == "style":
+            slot_id = target["slot"] if target else pr_id
+            if target is None:
+                slots["css"].append(slot_id)
+            colour = rng.choice(COLOURS)
+            pr.update(slot=slot_id)
+            pr["title"] = f"Tweak menu card accent ({pr_id})"
+            pr["body"] = f"Gives `.{slot_id}` cards a {colour} accent."
+            pr["changes"] = [{
+                "file": "static/styles.css",
+                "search": f"/* slot:{slot_id} */",
+                "replace": f".{pr_id} {{\n    border-color: {colour};\n}}\n\n/* slot:{slot_id} */",
+            }]
+
+        else:
+            path = target["path"] if target else f"config/{pr_id}.toml"
+            pr.update(path=path)
+            pr["title"] = f"Add {Path(path).name} config"
+            pr["body"] = f"Adds `{path}` with synthetic tool settings."
+            pr["changes"] = [{
+                "file": path,
+                "search": None,
+                "replace": f'[tool.{pr_id}]\nenabled = true\nlevel = {rng.randint(1, 9)}',
+            }]
+
+        prs.append(pr)
+        earlier.append(pr)
+    return prs, slots
+
+
+# ---------------------------------------------------------------------------
+# Base tree
+# ---------------------------------------------------------------------------
+
+def tracked_files(source):
+    """Return {path: (mode, bytes)} for every file tracked at HEAD in ``source``."""
+    listing = subprocess.run(
+        ["git", "-C", str(source), "ls-tree", "-r", "-z", "HEAD"],
+        capture_output=True, check=True,
+    ).stdout
+    files = {}
+    for entry in listing.split(b"\0"):
+        if not entry:
+            continue
+        meta, path = entry.split(b"\t", 1)
+        mode, kind, sha = meta.decode().split()
+        if kind != "blob":
+            continue
+        data = subprocess.run(
+            ["git", "-C", str(source), "cat-file", "blob", sha], capture_output=True, check=True,
+        ).stdout
+        files[path.decode()] = (mode, data)
+    return files
+
+
+def add_menu_slots(menu_source, slots, extra_items):
+    """Add slot markers to each menu list and raise MAX_MENU_SIZE to fit them."""
+    for list_name, slot_ids in slots.items():
+        if list_name == "css" or not slot_ids:
+            continue
+        start = menu_source.index(f"{list_name} = [")
+        end = menu_source.index("\n]\n", start)
+        markers = "".join(f"\n    # slot:{slot_id}" for slot_id in slot_ids)
+        menu_source = menu_source[:end] + markers + menu_source[end:]
+
+    def raise_limit(match):
+        return f"MAX_MENU_SIZE = {int(match.group(1)) + extra_items}"
+
+    return re.sub(r"^MAX_MENU_SIZE = (\d+)", raise_limit, menu_source, count=1, flags=re.M)
+
+
+def add_css_slots(css_source, slot_ids):
+    return css_source.rstrip("\n") + "".join(f"\n\n/* slot:{slot_id} */" for slot_id in slot_ids) + "\n"
+
+
+def build_base(files, slots, extra_items):
+    files = dict(files)
+    mode, menu = files["menu.py"]
+    files["menu.py"] = (mode, add_menu_slots(menu.decode(), slots, extra_items).encode())
+    mode, css = files["static/styles.css"]
+    files["static/styles.css"] = (mode, add_css_slots(css.decode(), slots["css"]).encode())
+    return files
+
+
+def apply_changes(base, changes):
+    """Return {path: bytes} for the files a PR's changes touch."""
+    result = {}
+    for change in changes:
+        path = change["file"]
+        if change["search"] is None:
+            result[path] = (change["replace"] + "\n").encode()
+            continue
+        content = result.get(path, base[path][1]).decode()
+        if change["search"] not in content:
+            raise ValueError(f"{change['search']!r} not found in {path}")
+        result[path] = content.replace(change["search"], change["replace"], 1).encode()
+    return result
+
+
+# ---------------------------------------------------------------------------
+# fast-import
+# ---------------------------------------------------------------------------
+
+def fast_import_stream(base, prs, base_branch, when):
+    """Yield the fast-import commands for the base commit and every PR branch."""
+    signature = f"Merge Queue Café <cafe@example.com> {when} +0000"
+
+    def data(payload):
+        if isinstance(payload, str):
+            payload = payload.encode()
+        return b"data %d\n" % len(payload) + payload + b"\n"
+
+    yield f"commit refs/heads/{base_branch}\nmark :1\ncommitter {signature}\n".encode()
+    yield data("Add synthetic slots for scale testing")
+    yield b"deleteall\n"
+    for path, (mode, content) in sorted(base.items()):
+        yield f"M {mode} inline {path}\n".encode() + data(content)
+
+    for mark, pr in enumerate(prs, 2):
+        yield f"commit refs/heads/{pr['branch']}\nmark :{mark}\ncommitter {signature}\n".encode()
+        yield data(pr["title"])
+        yield b"from :1\n"
+        for path, content in apply_changes(base, pr["changes"]).items():
+            mode = base[path][0] if path in base else "100644"
+            yield f"M {mode} inline {path}\n".encode() + data(content)
+    yield b"done\n"
+
+
+def existing_refs(repo):
+    return subprocess.run(
+        ["git", "-C", str(repo), "for-each-ref", "--format=%(refname)"],
+        capture_output=True, text=True, check=True,
+    ).stdout.split()
+
+
+def delete_scale_branches(repo, refs):
+    """Delete every scale-* branch in ``refs`` in a single ref transaction."""
+    stale = [ref for ref in refs if ref.startswith("refs/heads/scale-")]
+    if stale:
+        subprocess.run(
+            ["git", "-C", str(repo), "update-ref", "--stdin"],
+            input="".join(f"delete {ref}\n" for ref in stale), text=True, check=True,
+        )
+    return len(stale)
+
+
+def write_branches(repo, base, prs, base_branch, force=False):
+    repo = Path(repo)
+    if not repo.exists():
+        subprocess.run(
+            ["git", "init", "--bare", "--quiet", f"--initial-branch={base_branch}", str(repo)],
+            check=True,
+        )
+    refs = existing_refs(repo)
+    if refs and not force:
+        print(f"  {repo} already has {len(refs)} refs; pass --force to replace {base_branch} and scale-* branches")
+        sys.exit(1)
+    deleted = delete_scale_branches(repo, refs)
+    if deleted:
+        print(f"🧹 Deleted {deleted} old scale-* branches from {repo}")
+    proc = subprocess.Popen(
+        ["git", "-C", str(repo), "fast-import", "--quiet", "--force", "--done"],
+        stdin=subprocess.PIPE,
+    )
+    # If fast-import dies early the pipe breaks; its own error is already on
+    # stderr, so fall through to the exit status check.
+    with contextlib.suppress(BrokenPipeError):
+        for chunk in fast_import_stream(base, prs, base_branch, int(time.time())):
+            proc.stdin.write(chunk)
+    with contextlib.suppress(BrokenPipeError):
+        proc.stdin.close()
+    if proc.wait() != 0:
+        print("  git fast-import failed")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=500, help="number of PR branches")
+    parser.add_argument("--repo", required=True, help="local bare repository (created if missing)")
+    parser.add_argument("--source", default=str(ROOT), help="repository to take the base tree from")
+    parser.add_argument("--base-branch", default="main")
+    parser.add_argument("--conflict-rate", type=float, default=0.05)
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--manifest", help="write the generated PRs to this JSON file")
+    parser.add_argument("--force", action="store_true",
+                        help="replace the base branch and scale-* branches of an existing repository")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    prs, slots = generate_prs(args.count, args.conflict_rate, args.failure_rate, rng)
+    drinks = sum(1 for pr in prs if pr["kind"] == "drink")
+    base = build_base(tracked_files(args.source), slots, drinks)
+    print(f"🧪 Generated {len(prs)} PRs ({drinks} drinks) in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    write_branches(args.repo, base, prs, args.base_branch, args.force)
+    elapsed = time.perf_counter() - start
+    print(f"🌿 Wrote {len(prs)} branches to {args.repo} in {elapsed:.2f}s ({len(prs) / elapsed:,.0f}/s)")
+    print(f"   Conflicting PRs:       {sum(1 for pr in prs if pr['conflicts_with'])}")
+    print(f"   Semantic-failure PRs:  {sum(1 for pr in prs if pr['fails_with'])}")
+
+    if args.manifest:
+        Path(args.manifest).write_text(json.dumps(prs, indent=2) + "\n")
+        print(f"📝 Manifest written to {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
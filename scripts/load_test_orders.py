@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Load-test the /orders endpoint of a running Merge Queue Café app.
+
+Fires orders at the app from a pool of client threads, honouring the
+Retry-After hint on 429 responses, then prints latency and backpressure
+numbers alongside the kitchen's own metrics.
+
+Usage:
+    python3 app.py &
+    python3 scripts/load_test_orders.py [--url http://127.0.0.1:5000] [--clients 20] [--orders 200]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def request(url, payload=None):
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req) as response:
+            return response.status, response.headers, json.load(response)
+    except urllib.error.HTTPError as error:
+        try:
+            body = json.load(error)
+        except ValueError:
+            # Flask's own 404/500 pages are HTML, not JSON.
+            body = None
+        return error.code, error.headers, body
+
+
+def place_order(url, names, max_retries):
+    """Place one random order, retrying on 429. Return (latency, rejections, status)."""
+    payload = {"items": [{"name": random.choice(names), "quantity": random.randint(1, 3)}]}
+    rejections = 0
+    start = time.perf_counter()
+    while True:
+        status, headers, _ = request(f"{url}/orders", payload)
+        if status != 429 or rejections >= max_retries:
+            return time.perf_counter() - start, rejections, status
+        rejections += 1
+        time.sleep(float(headers.get("Retry-After", 1)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--names", nargs="+", default=["Drip Coffee", "Espresso", "Green Tea"])
+    args = parser.parse_args()
+
+    print(f"🚦 Sending {args.orders} orders from {args.clients} clients to {args.url}\n")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        results = list(pool.map(
+            lambda _: place_order(args.url, args.names, args.max_retries), range(args.orders)
+        ))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _, _ in results)
+    accepted = sum(1 for _, _, status in results if status == 202)
+    print(f"  Accepted:      {accepted}/{args.orders} in {elapsed:.1f}s ({accepted / elapsed:.1f}/s)")
+    print(f"  429 responses: {sum(rejections for _, rejections, _ in results)}")
+    print(f"  Gave up:       {sum(1 for _, _, status in results if status == 429)}")
+    print(f"  Latency p50:   {statistics.median(latencies) * 1000:.0f} ms")
+    print(f"  Latency p95:   {latencies[int((len(latencies) - 1) * 0.95)] * 1000:.0f} ms")
+
+    status, _, metrics = request(f"{args.url}/orders/metrics")
+    if metrics is None:
+        print(f"\n📊 Kitchen metrics unavailable (HTTP {status}).")
+        return
+    print("\n📊 Kitchen metrics:")
+    for key, value in metrics.items():
+        print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
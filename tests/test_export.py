@@ -0,0 +1,112 @@
+"""Tests for the static site export."""
+
+import gzip
+import json
+import threading
+
+import pytest
+
+from export import BackgroundExporter, export_site, fingerprint
+from menu_store import MenuStore
+
+
+def render(snapshot):
+    return "".join(f"<p>{item['name']} ${item['price']:.2f}</p>" for item in snapshot.menu)
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    static = tmp_path / "static"
+    static.mkdir()
+    (static / "styles.css").write_text("body { color: #3b2f2f; }\n")
+    return static
+
+
+def test_export_writes_page_assets_and_gzip(tmp_path, static_dir):
+    out = tmp_path / "build"
+    snapshot = MenuStore().current()
+    assert export_site(out, snapshot, render, static_dir=static_dir)
+
+    assert (out / "index.html").read_text() == render(snapshot)
+    assert gzip.decompress((out / "index.html.gz").read_bytes()) == render(snapshot).encode()
+
+    css = (static_dir / "styles.css").read_bytes()
+    fingerprinted = fingerprint("styles.css", css)
+    assert (out / "static" / "styles.css").read_bytes() == css
+    assert (out / "static" / fingerprinted).read_bytes() == css
+    assert json.loads((out / "manifest.json").read_text())["assets"] == {"styles.css": fingerprinted}
+
+
+def test_export_skips_when_nothing_changed(tmp_path, static_dir):
+    out = tmp_path / "build"
+    store = MenuStore()
+    assert export_site(out, store.current(), render, static_dir=static_dir)
+    assert not export_site(out, store.current(), render, static_dir=static_dir)
+
+    store.reprice_item("Green Tea", 3.00)
+    assert export_site(out, store.current(), render, static_dir=static_dir)
+    assert "$3.00" in (out / "index.html").read_text()
+
+
+def test_export_prunes_removed_static_files(tmp_path, static_dir):
+    out = tmp_path / "build"
+    (static_dir / "old.js").write_text("console.log('old');\n")
+    export_site(out, MenuStore().current(), render, static_dir=static_dir)
+    assert (out / "static" / "old.js").exists()
+
+    (static_dir / "old.js").unlink()
+    export_site(out, MenuStore().current(), render, static_dir=static_dir)
+    assert sorted(path.name for path in (out / "static").iterdir()) == sorted([
+        "styles.css",
+        "styles.css.gz",
+        fingerprint("styles.css", (static_dir / "styles.css").read_bytes()),
+        fingerprint("styles.css", (static_dir / "styles.css").read_bytes()) + ".gz",
+    ])
+
+
+def test_background_exporter_coalesces_changes(tmp_path, static_dir):
+    out = tmp_path / "build"
+    release = threading.Event()
+    rendered = []
+
+    def slow_render(snapshot):
+        release.wait()
+        rendered.append(snapshot.version)
+        return render(snapshot)
+
+    store = MenuStore()
+    exporter = BackgroundExporter(out, slow_render, static_dir=static_dir)
+    store.subscribe(exporter.submit)
+    exporter.submit(store.current())
+    for price in (3.00, 3.25, 3.50):
+        store.reprice_item("Green Tea", price)
+    assert store.current().version == 3
+
+    release.set()
+    assert exporter.wait(timeout=10)
+    assert rendered[-1] == 3
+    assert len(rendered) <= 2
+    assert "$3.50" in (out / "index.html").read_text()
+
+
+def test_background_exporter_logs_failures(tmp_path, static_dir, caplog):
+    def broken(snapshot):
+        raise RuntimeError("template bug")
+
+    exporter = BackgroundExporter(tmp_path / "build", broken, static_dir=static_dir)
+    exporter.submit(MenuStore().current())
+    assert exporter.wait(timeout=10)
+    assert "template bug" in caplog.text
+
+
+def test_export_matches_live_index(tmp_path):
+    pytest.importorskip("flask")
+    from app import app, menu_store, render_menu_page
+
+    def render_page(snapshot):
+        with app.test_request_context("/"):
+            return render_menu_page(snapshot)
+
+    out = tmp_path / "build"
+    export_site(out, menu_store.current(), render_page, static_dir=app.static_folder)
+    assert (out / "index.html").read_bytes() == app.test_client().get("/").data
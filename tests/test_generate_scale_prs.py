@@ -0,0 +1,113 @@
+"""Tests for the synthetic PR generator."""
+
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from generate_scale_prs import (  # noqa: E402
+    add_menu_slots,
+    apply_changes,
+    build_base,
+    existing_refs,
+    generate_prs,
+    write_branches,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_menu(source):
+    namespace = {}
+    exec(compile(source, "menu.py", "exec"), namespace)
+    return namespace
+
+
+@pytest.fixture
+def files():
+    return {
+        path: ("100644", (ROOT / path).read_bytes())
+        for path in ("menu.py", "static/styles.css")
+    }
+
+
+def test_generate_prs_is_deterministic():
+    first, _ = generate_prs(50, 0.2, 0.2, random.Random(7))
+    second, _ = generate_prs(50, 0.2, 0.2, random.Random(7))
+    assert first == second
+
+
+def test_clean_prs_each_get_their_own_slot():
+    prs, slots = generate_prs(200, 0.0, 0.0, random.Random(1))
+    assert len({pr["branch"] for pr in prs}) == 200
+    assert not any(pr["conflicts_with"] or pr["fails_with"] for pr in prs)
+    menu_slots = [slot for name, ids in slots.items() if name != "css" for slot in ids]
+    assert len(menu_slots) == sum(1 for pr in prs if pr["kind"] == "drink")
+    assert len(slots["css"]) == sum(1 for pr in prs if pr["kind"] == "style")
+
+
+def test_conflicting_prs_edit_the_same_place():
+    prs, _ = generate_prs(30, 1.0, 0.0, random.Random(1))
+    by_branch = {pr["branch"]: pr for pr in prs}
+    conflicting = [pr for pr in prs if pr["conflicts_with"]]
+    assert conflicting
+    for pr in conflicting:
+        target = by_branch[pr["conflicts_with"]]
+        assert pr["changes"][0]["file"] == target["changes"][0]["file"]
+        assert pr["changes"][0]["search"] == target["changes"][0]["search"]
+
+
+def test_failing_drinks_reuse_another_drink_name():
+    prs, _ = generate_prs(30, 0.0, 1.0, random.Random(1))
+    by_branch = {pr["branch"]: pr for pr in prs}
+    failing = [pr for pr in prs if pr["fails_with"]]
+    assert failing
+    for pr in failing:
+        assert pr["name"] == by_branch[pr["fails_with"]]["name"]
+
+
+def test_add_menu_slots_keeps_menu_valid(files):
+    source = files["menu.py"][1].decode()
+    slots = {"COFFEE_ITEMS": ["scale-a"], "TEA_ITEMS": ["scale-b"], "OTHER_ITEMS": [], "css": []}
+    result = add_menu_slots(source, slots, extra_items=10)
+    assert "    # slot:scale-a\n" in result
+    assert "    # slot:scale-b\n" in result
+    assert load_menu(result)["MAX_MENU_SIZE"] == load_menu(source)["MAX_MENU_SIZE"] + 10
+
+
+def test_apply_changes_adds_drink_to_base(files):
+    prs, slots = generate_prs(20, 0.0, 0.0, random.Random(3))
+    drinks = [pr for pr in prs if pr["kind"] == "drink"]
+    base = build_base(files, slots, len(drinks))
+
+    changed = apply_changes(base, drinks[0]["changes"])
+    menu = load_menu(changed["menu.py"].decode())
+    assert drinks[0]["name"] in [item["name"] for item in menu["MENU_ITEMS"]]
+
+
+def test_apply_changes_rejects_missing_slot(files):
+    with pytest.raises(ValueError):
+        apply_changes(files, [{"file": "menu.py", "search": "# slot:nope", "replace": ""}])
+
+
+def test_write_branches_refuses_existing_repo_without_force(tmp_path, files):
+    repo = tmp_path / "scale.git"
+    prs, slots = generate_prs(6, 0.0, 0.0, random.Random(1))
+    write_branches(repo, build_base(files, slots, 6), prs, "main")
+    first = set(existing_refs(repo))
+    assert first == {"refs/heads/main"} | {f"refs/heads/{pr['branch']}" for pr in prs}
+
+    with pytest.raises(SystemExit):
+        write_branches(repo, build_base(files, slots, 6), prs, "main")
+
+    prs, slots = generate_prs(3, 0.0, 0.0, random.Random(2))
+    write_branches(repo, build_base(files, slots, 3), prs, "main", force=True)
+    assert set(existing_refs(repo)) == {"refs/heads/main"} | {f"refs/heads/{pr['branch']}" for pr in prs}
+    log = subprocess.run(
+        ["git", "-C", str(repo), "rev-list", "--count", "main"], capture_output=True, text=True, check=True,
+    )
+    assert log.stdout.strip() == "1"
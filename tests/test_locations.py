@@ -0,0 +1,75 @@
+"""Tests for per-location menus."""
+
+import pytest
+
+from locations import LocationMenus, LocationOverlay
+from menu import MAX_MENU_SIZE
+from menu_store import MenuError, MenuStore
+
+ICED_TEA = {"name": "Iced Tea", "category": "tea", "price": 3.25, "description": "Over ice."}
+
+
+@pytest.fixture
+def store():
+    return MenuStore()
+
+
+@pytest.fixture
+def locations(store):
+    return LocationMenus(store, overlays=[
+        LocationOverlay(slug="downtown", name="Downtown"),
+        LocationOverlay(slug="airport", name="Airport", prices={"Green Tea": 3.50}, removed=frozenset({"Espresso"})),
+        LocationOverlay(slug="harbor", name="Harbor", items=(ICED_TEA,), max_menu_size=MAX_MENU_SIZE + 1),
+    ])
+
+
+def names(snapshot):
+    return [item["name"] for item in snapshot.menu]
+
+
+def test_location_without_overlay_shares_base_snapshot(store, locations):
+    assert locations.current("downtown") is store.current()
+
+
+def test_overlay_prices_removals_and_additions(locations):
+    airport = locations.current("airport")
+    assert "Espresso" not in names(airport)
+    assert [item["price"] for item in airport.menu if item["name"] == "Green Tea"] == [3.50]
+
+    harbor = locations.current("harbor")
+    assert "Iced Tea" in names(harbor)
+    assert "tea" in harbor.categories
+
+
+def test_unchanged_items_are_shared_with_base(store, locations):
+    base = {item["name"]: item for item in store.current().menu}
+    airport = {item["name"]: item for item in locations.current("airport").menu}
+    assert "Drip Coffee" in base
+    assert airport["Drip Coffee"] is base["Drip Coffee"]
+
+
+def test_location_menu_size_limit(store, locations):
+    with pytest.raises(MenuError):
+        locations.set_overlay(LocationOverlay(slug="tiny", name="Tiny", max_menu_size=1))
+
+
+def test_pages_are_cached_and_invalidated_per_location(store, locations):
+    renders = []
+
+    def render(snapshot):
+        renders.append(snapshot)
+        return ",".join(names(snapshot))
+
+    locations.page("airport", render)
+    locations.page("harbor", render)
+    locations.page("airport", render)
+    assert len(renders) == 2
+
+    locations.set_overlay(LocationOverlay(slug="airport", name="Airport"))
+    locations.page("airport", render)
+    locations.page("harbor", render)
+    assert len(renders) == 3
+
+    store.reprice_item("Drip Coffee", 3.75)
+    locations.page("harbor", render)
+    assert len(renders) == 4
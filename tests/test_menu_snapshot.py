@@ -0,0 +1,114 @@
+"""Tests for the shared-memory menu snapshot."""
+
+import multiprocessing
+import sys
+import time
+
+import pytest
+
+from menu_snapshot import (
+    READ_TIMEOUT,
+    SEQUENCE,
+    SEQUENCE_OFFSET,
+    MenuSnapshotPublisher,
+    MenuSnapshotReader,
+    decode_menu,
+    encode_menu,
+)
+from menu_store import MenuStore
+
+MAX_SIZE = 42
+
+
+@pytest.fixture
+def base():
+    return MenuStore().current()
+
+
+@pytest.fixture
+def publisher(base):
+    publisher = MenuSnapshotPublisher(MAX_SIZE, capacity=len(encode_menu(base.menu)) + 4096)
+    yield publisher
+    publisher.close()
+
+
+def read_in_child(name, results):
+    reader = MenuSnapshotReader(name)
+    results.put((
+        [item["name"] for item in reader.get_menu()],
+        reader.max_size,
+        "menu" in sys.modules,
+    ))
+    reader.close()
+
+
+def test_encode_decode_round_trip(base):
+    menu = base.get_menu()
+    assert list(decode_menu(encode_menu(menu), len(menu))) == menu
+
+
+def test_reader_sees_published_menu(publisher, base):
+    publisher.publish(base.menu)
+    reader = MenuSnapshotReader(publisher.name)
+    assert reader.get_menu() == base.get_menu()
+    assert reader.get_categories() == base.get_categories()
+    assert reader.max_size == MAX_SIZE
+    reader.close()
+
+
+def test_reader_in_another_process(publisher, base):
+    publisher.publish(base.menu)
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    child = context.Process(target=read_in_child, args=(publisher.name, results))
+    child.start()
+    names, max_size, loaded_menu = results.get(timeout=30)
+    child.join(timeout=30)
+
+    assert child.exitcode == 0
+    assert names == [item["name"] for item in base.menu]
+    assert max_size == MAX_SIZE
+    assert not loaded_menu
+
+
+def test_reader_switches_to_new_version(publisher, base):
+    publisher.publish(base.menu)
+    reader = MenuSnapshotReader(publisher.name)
+    assert reader.version == 1
+
+    publisher.publish([
+        {"name": "Mocha", "category": "coffee", "price": 4.75, "description": "Chocolate and espresso."},
+    ])
+    assert reader.version == 2
+    assert [item["name"] for item in reader.get_menu()] == ["Mocha"]
+    reader.close()
+
+
+def test_publish_rejects_oversized_menu(base):
+    publisher = MenuSnapshotPublisher(MAX_SIZE, capacity=16)
+    try:
+        with pytest.raises(ValueError):
+            publisher.publish(base.menu)
+    finally:
+        publisher.close()
+
+
+def test_reader_keeps_last_version_if_publisher_stalls(publisher, base):
+    publisher.publish(base.menu)
+    reader = MenuSnapshotReader(publisher.name)
+    assert reader.get_menu() == base.get_menu()
+
+    # Leave the sequence odd, as a publisher that died mid-write would.
+    SEQUENCE.pack_into(publisher.shm.buf, SEQUENCE_OFFSET, publisher.sequence + 1)
+    assert reader.get_menu() == base.get_menu()
+
+    # Only the first read waits out the timeout; later reads skip straight
+    # to the last good version until the sequence moves.
+    start = time.monotonic()
+    for _ in range(20):
+        assert reader.get_menu() == base.get_menu()
+    assert time.monotonic() - start < READ_TIMEOUT
+
+    publisher.publish(base.menu[:1])
+    assert len(reader.get_menu()) == 1
+    reader.close()
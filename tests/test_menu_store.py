@@ -0,0 +1,124 @@
+"""Tests for copy-on-write menu snapshots."""
+
+import gc
+import threading
+import weakref
+
+import pytest
+
+from menu import MAX_MENU_SIZE, get_categories, get_menu
+from menu_store import MenuError, MenuStore
+
+MOCHA = {"name": "Mocha", "category": "coffee", "price": 4.75, "description": "Chocolate and espresso."}
+
+
+def test_initial_snapshot_matches_menu():
+    snapshot = MenuStore().current()
+    assert snapshot.version == 0
+    assert snapshot.get_menu() == get_menu()
+    assert snapshot.get_categories() == get_categories()
+
+
+def test_add_item_publishes_new_version():
+    store = MenuStore(max_size=MAX_MENU_SIZE + 1)
+    before = store.current()
+    after = store.add_item(MOCHA)
+    assert after.version == before.version + 1
+    assert "Mocha" in [item["name"] for item in after.menu]
+    assert "Mocha" not in [item["name"] for item in before.menu]
+
+
+def test_snapshot_items_are_read_only():
+    item = MenuStore().current().menu[0]
+    with pytest.raises(TypeError):
+        item["price"] = 0.01
+
+
+def test_reprice_and_remove():
+    store = MenuStore()
+    store.reprice_item("Green Tea", 3.00)
+    assert [item["price"] for item in store.current().menu if item["name"] == "Green Tea"] == [3.00]
+    store.remove_item("Green Tea")
+    assert "Green Tea" not in [item["name"] for item in store.current().menu]
+
+
+def test_failed_transaction_publishes_nothing():
+    store = MenuStore()
+    before = store.current()
+    with pytest.raises(MenuError):
+        store.apply([
+            {"op": "reprice", "name": "Drip Coffee", "price": 1.00},
+            {"op": "remove", "name": "Flat White"},
+        ])
+    assert store.current() is before
+
+
+@pytest.mark.parametrize("item", [
+    {**MOCHA, "name": ["Mocha"]},
+    {**MOCHA, "category": 5},
+    {**MOCHA, "description": "  "},
+    {**MOCHA, "price": float("nan")},
+    {**MOCHA, "price": float("inf")},
+])
+def test_add_item_rejects_invalid_fields(item):
+    with pytest.raises(MenuError):
+        MenuStore(max_size=MAX_MENU_SIZE + 1).add_item(item)
+
+
+def test_reprice_rejects_non_finite_price():
+    with pytest.raises(MenuError):
+        MenuStore().reprice_item("Green Tea", float("nan"))
+
+
+def test_menu_size_limit_is_enforced():
+    store = MenuStore(items=[MOCHA], max_size=1)
+    with pytest.raises(MenuError):
+        store.add_item({**MOCHA, "name": "Iced Mocha"})
+
+
+def test_old_snapshots_are_reclaimed():
+    store = MenuStore()
+    old = weakref.ref(store.current())
+    store.reprice_item("Green Tea", 3.00)
+    gc.collect()
+    assert old() is None
+
+
+def test_readers_never_see_partial_transactions():
+    store = MenuStore()
+    names = [item["name"] for item in store.current().menu]
+    stop = threading.Event()
+    torn = []
+
+    def read():
+        while not stop.is_set():
+            snapshot = store.current()
+            prices = {item["price"] for item in snapshot.menu}
+            if snapshot.version and len(prices) != 1:
+                torn.append(prices)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for round_ in range(1, 200):
+        store.apply([{"op": "reprice", "name": name, "price": float(round_)} for name in names])
+    stop.set()
+    for reader in readers:
+        reader.join()
+    assert torn == []
+
+
+def test_failing_listener_does_not_undo_the_change(caplog):
+    store = MenuStore()
+    seen = []
+
+    def broken(snapshot):
+        raise RuntimeError("listener bug")
+
+    store.subscribe(broken)
+    store.subscribe(seen.append)
+    snapshot = store.reprice_item("Green Tea", 3.00)
+
+    assert store.current() is snapshot
+    assert seen == [snapshot]
+    assert "listener bug" in caplog.text
@@ -0,0 +1,85 @@
+"""Tests for order intake and the kitchen scheduler."""
+
+import threading
+
+import pytest
+
+from menu_store import MenuStore
+from orders import Kitchen, KitchenFullError, OrderError
+
+
+@pytest.fixture
+def snapshot():
+    return MenuStore().current()
+
+
+def test_rejects_items_not_on_menu(snapshot):
+    with pytest.raises(OrderError):
+        Kitchen().submit([{"name": "Flat White"}], snapshot)
+
+
+def test_rejects_bad_quantity(snapshot):
+    with pytest.raises(OrderError):
+        Kitchen().submit([{"name": "Green Tea", "quantity": 0}], snapshot)
+
+
+def test_prep_time_uses_per_item_times(snapshot):
+    kitchen = Kitchen(prep_times={"Green Tea": 0.5}, default_prep_seconds=3.0)
+    order = kitchen.submit(
+        [{"name": "Green Tea", "quantity": 2}, {"name": "Espresso"}], snapshot
+    )
+    assert order.prep_seconds == 4.0
+    assert order.status == "queued"
+
+
+def test_full_queue_applies_backpressure(snapshot):
+    kitchen = Kitchen(stations=2, queue_size=2, prep_times={"Espresso": 5.0}, default_prep_seconds=1.0)
+    kitchen.submit([{"name": "Espresso"}], snapshot)
+    kitchen.submit([{"name": "Espresso", "quantity": 2}], snapshot)
+    with pytest.raises(KitchenFullError) as excinfo:
+        kitchen.submit([{"name": "Green Tea"}], snapshot)
+    assert excinfo.value.retry_after == 8
+    assert kitchen.metrics()["rejected"] == 1
+
+
+def test_stations_process_orders(snapshot):
+    release = threading.Event()
+    kitchen = Kitchen(stations=2, queue_size=10, sleep=lambda seconds: release.wait())
+    kitchen.start()
+    orders = [kitchen.submit([{"name": "Green Tea"}], snapshot) for _ in range(5)]
+    release.set()
+    kitchen.stop()
+
+    assert all(order.status == "ready" for order in orders)
+    metrics = kitchen.metrics()
+    assert metrics["completed"] == 5
+    assert metrics["queue_depth"] == 0
+    assert metrics["in_progress"] == 0
+
+
+@pytest.mark.parametrize("config", [
+    {"stations": 0},
+    {"queue_size": 0},
+    {"default_prep_seconds": -1.0},
+    {"default_prep_seconds": float("inf")},
+    {"prep_times": {"Espresso": "fast"}},
+    {"prep_times": {"Espresso": float("nan")}},
+    {"prep_times": [("Espresso", 1.0)]},
+])
+def test_rejects_invalid_config(config):
+    with pytest.raises(ValueError):
+        Kitchen(**config)
+
+
+def test_order_ids_are_unique_across_kitchens(snapshot):
+    first = Kitchen().submit([{"name": "Green Tea"}], snapshot)
+    second = Kitchen().submit([{"name": "Green Tea"}], snapshot)
+    assert first.id != second.id
+
+
+def test_start_is_idempotent(snapshot):
+    kitchen = Kitchen(stations=2, sleep=lambda seconds: None)
+    kitchen.start()
+    kitchen.start()
+    assert len(kitchen._threads) == 2
+    kitchen.stop()